@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+#
+# benchmarks/__init__.py
+#
+"""
+Benchmarks for the parsing_tools packages, these are not installed.
+"""
+__docformat__ = "restructuredtext en"
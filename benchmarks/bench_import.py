@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+#
+# benchmarks/bench_import.py
+#
+# See MIT License file.
+#
+"""
+Cold start benchmark for the xml2dict and mimeparser packages.
+
+Each statement is run in a fresh interpreter with `python -X importtime`
+and the cumulative time of every module it imports is added up, modules
+already imported by an empty interpreter are not counted. The results
+are:
+ - total_ms -- Import time of the statement, best of `repeat` runs.
+ - modules  -- Number of modules imported by the statement.
+ - slowest  -- The modules with the largest cumulative time.
+
+The `import` statement only imports the packages, it must stay within
+the budget or the exit status is 1. The other statements show what the
+first use of each package costs.
+
+Examples:
+  $ python -m benchmarks.bench_import
+  $ python -m benchmarks.bench_import -r 10 --budget 20
+"""
+__docformat__ = "restructuredtext en"
+
+import os
+import sys
+import argparse
+import subprocess
+
+STATEMENTS = {
+    'import': "import xml2dict, mimeparser",
+    'xml2dict': "import xml2dict; xml2dict.XML2Dict().parse(b'<a/>')",
+    'mimeparser': ("import mimeparser; "
+                   "mimeparser.MIMEParser().best_match(['text/html'], "
+                   "'text/*')"),
+    }
+BUDGET_MS = 25.0
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(stmt):
+    """
+    Run `stmt` in a new interpreter and return a list of (depth, self_us,
+    cumulative_us, module) for each module imported.
+    """
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', stmt],
+                          cwd=ROOT, stderr=subprocess.PIPE,
+                          universal_newlines=True)
+
+    if proc.returncode:
+        raise RuntimeError("Statement {!r} failed:\n{}".format(
+            stmt, proc.stderr))
+
+    times = []
+
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        fields = line[len('import time:'):].split('|')
+
+        if not fields[0].strip().isdigit():  # The column headings.
+            continue
+
+        name = fields[2].rstrip()
+        module = name.lstrip()
+        depth = (len(name) - len(module) - 1) // 2
+        times.append((depth, int(fields[0]), int(fields[1]), module))
+
+    return times
+
+
+class ImportBenchmark(object):
+
+    def __init__(self, statements=STATEMENTS, repeat=5):
+        self._statements = statements
+        self._repeat = repeat
+
+    def run(self):
+        """
+        Measure every statement. Returns a list of result dicts.
+        """
+        base = {module for depth, s, c, module in import_times('pass')}
+        results = []
+
+        for name, stmt in self._statements.items():
+            best = None
+
+            for _ in range(self._repeat):
+                result = self.measure(stmt, base)
+
+                if best is None or result['total_ms'] < best['total_ms']:
+                    best = result
+
+            best['name'] = name
+            results.append(best)
+
+        return results
+
+    @staticmethod
+    def measure(stmt, base=()):
+        # Modules are only listed the first time they are imported, so a
+        # top level module not in base was imported by the statement.
+        times = [t for t in import_times(stmt) if t[3] not in base]
+        total = sum(cumul for depth, s, cumul, m in times if depth == 0)
+        slowest = sorted(times, key=lambda t: t[2], reverse=True)[:5]
+        return {'stmt': stmt,
+                'total_ms': total / 1000,
+                'modules': len(times),
+                'slowest': [(module, cumul / 1000)
+                            for d, s, cumul, module in slowest]}
+
+    @staticmethod
+    def report(results, fp=None):
+        fp = fp or sys.stdout
+
+        for result in results:
+            fp.write("{:<11}{:>8.2f} ms {:>4} modules  {}\n".format(
+                result['name'], result['total_ms'], result['modules'],
+                ', '.join("{} {:.2f}".format(*item)
+                          for item in result['slowest'])))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='bench_import', description="Benchmark the package import "
+        "times.")
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=5,
+        help="Runs for each statement, the best is kept, default 5.")
+    parser.add_argument(
+        '--budget', type=float, default=BUDGET_MS,
+        help="Milliseconds importing the packages can take, default "
+        "{}.".format(BUDGET_MS))
+    options = parser.parse_args(argv)
+    bench = ImportBenchmark(repeat=options.repeat)
+    results = bench.run()
+    bench.report(results)
+
+    for result in results:
+        if result['name'] == 'import' and result['total_ms'] > options.budget:
+            sys.stdout.write("OVER BUDGET {}: {:.2f} ms, budget {:.2f} "
+                             "ms\n".format(result['stmt'], result['total_ms'],
+                                           options.budget))
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
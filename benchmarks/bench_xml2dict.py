@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+#
+# benchmarks/bench_xml2dict.py
+#
+# See MIT License file.
+#
+"""
+Throughput and memory benchmarks for xml2dict.
+
+For each shape, size and mode a synthetic document is written to a
+temporary file then parsed. The results are:
+ - mb_per_s  -- Parse throughput, best of `repeat` runs.
+ - us_per_el -- Microseconds per element, best of `repeat` runs.
+ - tm_peak   -- Peak memory allocated by Python, from tracemalloc.
+ - rss_peak  -- Peak RSS growth of a fresh process running the mode once,
+                only where the resource module is available.
+
+Results can be saved and later runs compared against them. A mode that is
+slower, or uses more memory, than the baseline by more than the threshold
+is flagged as a regression and the exit status is 1.
+
+Examples:
+  $ python -m benchmarks.bench_xml2dict
+  $ python -m benchmarks.bench_xml2dict -s wide -z 1MB -z 100MB -m parse
+  $ python -m benchmarks.bench_xml2dict --save baseline.json
+  $ python -m benchmarks.bench_xml2dict --baseline baseline.json
+"""
+__docformat__ = "restructuredtext en"
+
+import io
+import os
+import gc
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+import multiprocessing
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+from xml2dict import XML2Dict
+from xml2dict.stream import XML2JSON
+
+from .generators import DocumentGenerator
+
+
+def _mode_parse(path):
+    with io.open(path, 'rb') as f:
+        return XML2Dict().parse(f)
+
+
+def _mode_stats(path):
+    with io.open(path, 'rb') as f:
+        return XML2Dict(stats=True).parse(f)
+
+
+def _mode_lazy(path):
+    with io.open(path, 'rb') as f:
+        return XML2Dict(lazy=True).parse(f)
+
+
+def _mode_iterparse(path):
+    count = 0
+
+    with io.open(path, 'rb') as f:
+        for record in XML2Dict().iterparse(f, DocumentGenerator.RECORD_PATH):
+            count += 1
+
+    return count
+
+
+def _mode_columns(path):
+    with io.open(path, 'rb') as f:
+        return XML2Dict().parse_columns(f, DocumentGenerator.RECORD_PATH,
+                                        {'value': '.'})
+
+
+def _mode_dump(path):
+    with io.open(path, 'rb') as f, io.open(os.devnull, 'w') as out:
+        XML2JSON().dump(f, out)
+
+
+MODES = {
+    'parse': _mode_parse,
+    'stats': _mode_stats,
+    'lazy': _mode_lazy,
+    'iterparse': _mode_iterparse,
+    'columns': _mode_columns,
+    'dump': _mode_dump,
+    }
+
+
+def _rss_worker(conn, mode, path):
+    """
+    Run in a fresh process so the peak RSS only belongs to this mode.
+    """
+    before = _max_rss()
+    MODES[mode](path)
+    conn.send(_max_rss() - before)
+    conn.close()
+
+
+def _max_rss():
+    # ru_maxrss is kept across exec so it can be the parent's peak, Linux
+    # resets VmHWM for the new process.
+    try:
+        with io.open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (IOError, OSError):
+        pass
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB and macOS bytes.
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+class Benchmark(object):
+    KEY_FIELDS = ('shape', 'size', 'mode')
+
+    def __init__(self, shapes=DocumentGenerator.SHAPES, sizes=('64KB',),
+                 modes=tuple(MODES), repeat=3, rss=True, workdir=None):
+        self._shapes = shapes
+        self._sizes = sizes
+        self._modes = modes
+        self._repeat = repeat
+        self._rss = rss and resource is not None
+        self._workdir = workdir
+
+        for mode in modes:
+            if mode not in MODES:
+                raise ValueError("Invalid mode {!r}, must be one of "
+                                 "{}".format(mode, ', '.join(MODES)))
+
+    def run(self):
+        """
+        Run every combination of shape, size and mode. Returns a list of
+        result dicts.
+        """
+        results = []
+
+        for shape in self._shapes:
+            generator = DocumentGenerator(shape)
+
+            for size in self._sizes:
+                fd, path = tempfile.mkstemp(suffix='.xml', dir=self._workdir)
+
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        nbytes, elements = generator.write(f, size)
+
+                    for mode in self._modes:
+                        result = self.measure(mode, path, nbytes, elements)
+                        result.update(shape=shape, size=size)
+                        results.append(result)
+                finally:
+                    os.remove(path)
+
+        return results
+
+    def measure(self, mode, path, nbytes, elements):
+        func = MODES[mode]
+        best = None
+
+        for _ in range(self._repeat):
+            gc.collect()
+            start = time.perf_counter()
+            func(path)
+            seconds = time.perf_counter() - start
+            best = seconds if best is None else min(best, seconds)
+
+        gc.collect()
+        tracemalloc.start()
+
+        try:
+            data = func(path)
+            tm_peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        del data
+        best = max(best, 1e-9)
+        return {'mode': mode,
+                'bytes': nbytes,
+                'elements': elements,
+                'seconds': best,
+                'mb_per_s': nbytes / best / 1024 ** 2,
+                'us_per_el': best / elements * 1e6,
+                'tm_peak': tm_peak,
+                'rss_peak': self._measure_rss(mode, path)}
+
+    def _measure_rss(self, mode, path):
+        if not self._rss:
+            return None
+
+        ctx = multiprocessing.get_context('spawn')
+        recv, send = ctx.Pipe(duplex=False)
+        proc = ctx.Process(target=_rss_worker, args=(send, mode, path))
+        proc.start()
+        send.close()
+
+        try:
+            rss = recv.recv()
+        except EOFError:
+            rss = None
+
+        proc.join()
+        return rss
+
+    @classmethod
+    def key(cls, result):
+        return ':'.join(str(result[field]) for field in cls.KEY_FIELDS)
+
+    @classmethod
+    def compare(cls, results, baseline, threshold=0.2):
+        """
+        Compare results with baseline results. Returns a list of messages,
+        one for each regression found.
+        """
+        base = {cls.key(result): result for result in baseline}
+        regressions = []
+
+        for result in results:
+            old = base.get(cls.key(result))
+
+            if old is None:
+                continue
+
+            if result['mb_per_s'] < old['mb_per_s'] * (1 - threshold):
+                regressions.append(
+                    "{}: throughput {:.2f} MB/s, baseline {:.2f} "
+                    "MB/s".format(cls.key(result), result['mb_per_s'],
+                                  old['mb_per_s']))
+
+            for field in ('tm_peak', 'rss_peak'):
+                new_mem, old_mem = result.get(field), old.get(field)
+
+                if (new_mem is not None and old_mem
+                        and new_mem > old_mem * (1 + threshold)):
+                    regressions.append(
+                        "{}: {} {}, baseline {}".format(
+                            cls.key(result), field, _human(new_mem),
+                            _human(old_mem)))
+
+        return regressions
+
+    @staticmethod
+    def report(results, fp=None):
+        fp = fp or sys.stdout
+        fmt = "{:<11}{:>8} {:<10}{:>10}{:>11}{:>11}{:>11}\n"
+        fp.write(fmt.format('shape', 'size', 'mode', 'MB/s', 'us/elem',
+                            'tm_peak', 'rss_peak'))
+
+        for result in results:
+            fp.write(fmt.format(
+                result['shape'], result['size'], result['mode'],
+                "{:.2f}".format(result['mb_per_s']),
+                "{:.3f}".format(result['us_per_el']),
+                _human(result['tm_peak']), _human(result['rss_peak'])))
+
+
+def _human(nbytes):
+    if nbytes is None:
+        return '-'
+
+    for unit in ('B', 'KB', 'MB'):
+        if abs(nbytes) < 1024:
+            return "{:.0f}{}".format(nbytes, unit)
+
+        nbytes /= 1024
+
+    return "{:.1f}GB".format(nbytes)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='bench_xml2dict', description="Benchmark xml2dict.")
+    parser.add_argument(
+        '-s', '--shape', action='append', choices=DocumentGenerator.SHAPES,
+        help="Document shape, can be given more than once, default all.")
+    parser.add_argument(
+        '-z', '--size', action='append', help="Document size such as 64KB, "
+        "10MB or 1GB, can be given more than once, default 64KB and 1MB.")
+    parser.add_argument(
+        '-m', '--mode', action='append', choices=tuple(MODES),
+        help="Mode to run, can be given more than once, default all.")
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=3,
+        help="Timed runs for each case, the best is kept, default 3.")
+    parser.add_argument(
+        '--no-rss', action='store_true',
+        help="Do not measure RSS in a separate process.")
+    parser.add_argument(
+        '--workdir', help="Directory for the generated documents.")
+    parser.add_argument(
+        '--save', type=argparse.FileType('w'),
+        help="Save the results as JSON to use as a baseline.")
+    parser.add_argument(
+        '--baseline', type=argparse.FileType('r'),
+        help="Compare with the results saved in this file.")
+    parser.add_argument(
+        '--threshold', type=float, default=0.2,
+        help="Fraction a result can be worse than the baseline before it "
+        "is a regression, default 0.2.")
+    options = parser.parse_args(argv)
+    bench = Benchmark(shapes=options.shape or DocumentGenerator.SHAPES,
+                      sizes=options.size or ('64KB', '1MB'),
+                      modes=options.mode or tuple(MODES),
+                      repeat=options.repeat, rss=not options.no_rss,
+                      workdir=options.workdir)
+    results = bench.run()
+    bench.report(results)
+
+    if options.save:
+        json.dump(results, options.save, indent=2)
+
+    if options.baseline:
+        regressions = bench.compare(results, json.load(options.baseline),
+                                    threshold=options.threshold)
+
+        for msg in regressions:
+            sys.stdout.write("REGRESSION {}\n".format(msg))
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#
+# benchmarks/generators.py
+#
+# See MIT License file.
+#
+"""
+Synthetic XML documents for the benchmarks.
+
+Each shape repeats a record under the root element until the document
+reaches the requested size, so any size from KB to GB can be written
+without holding the document in memory. The content only depends on the
+record number so the documents are the same on every run.
+
+Shapes:
+ - wide       -- Many small sibling elements.
+ - deep       -- Records nested DEPTH elements deep.
+ - attributes -- Records with ATTRIBUTES attributes and no text.
+ - namespaces -- Records using NAMESPACES different namespaces.
+ - text       -- Records with a long text value.
+"""
+__docformat__ = "restructuredtext en"
+
+import re
+
+
+class DocumentGenerator(object):
+    DEPTH = 32
+    ATTRIBUTES = 20
+    NAMESPACES = 8
+    TEXT_WORDS = 200
+    SHAPES = ('wide', 'deep', 'attributes', 'namespaces', 'text')
+    # The selector path of the records, for XML2Dict.iterparse().
+    RECORD_PATH = '/root/*'
+    __SIZE_REGEX = r"^(?P<num>\d+(\.\d+)?)\s*(?P<unit>[KMG]?B?)$"
+    __SIZE_OBJ = re.compile(__SIZE_REGEX, re.IGNORECASE)
+    __UNITS = {'': 1, 'B': 1, 'K': 1024, 'KB': 1024, 'M': 1024 ** 2,
+               'MB': 1024 ** 2, 'G': 1024 ** 3, 'GB': 1024 ** 3}
+    __WORDS = ('lorem', 'ipsum', 'dolor', 'sit', 'amet', 'consectetur',
+               'adipiscing', 'elit', 'sed', 'do', 'eiusmod', 'tempor')
+    __NSPACE = 'urn:parsing-tools:bench:{}'
+
+    def __init__(self, shape):
+        if shape not in self.SHAPES:
+            raise ValueError("Invalid shape {!r}, must be one of "
+                             "{}".format(shape, ', '.join(self.SHAPES)))
+
+        self.shape = shape
+        self.__record = getattr(self, '_{}_record'.format(shape))
+
+    @classmethod
+    def parse_size(cls, size):
+        """
+        Convert a size such as 64KB, 10MB or 1GB into bytes.
+        """
+        if isinstance(size, int):
+            return size
+
+        sre = cls.__SIZE_OBJ.search(size.strip())
+
+        if not sre:
+            raise ValueError("Invalid size: {!r}".format(size))
+
+        unit = cls.__UNITS[sre.group('unit').upper()]
+        return int(float(sre.group('num')) * unit)
+
+    def write(self, fp, size):
+        """
+        Write a document of at least `size` bytes to the binary file `fp`.
+        Returns a tuple of the number of bytes and elements written.
+        """
+        size = self.parse_size(size)
+        header = self._header().encode('utf-8')
+        footer = b'</root>\n'
+        fp.write(header)
+        written = len(header) + len(footer)
+        elements = 1
+        num = 0
+
+        while written < size:
+            record, count = self.__record(num)
+            record = record.encode('utf-8')
+            fp.write(record)
+            written += len(record)
+            elements += count
+            num += 1
+
+        fp.write(footer)
+        return written, elements
+
+    def _header(self):
+        if self.shape == 'namespaces':
+            decls = ''.join(' xmlns:n{0}="{1}"'.format(
+                idx, self.__NSPACE.format(idx))
+                for idx in range(self.NAMESPACES))
+            return '<?xml version="1.0" encoding="UTF-8"?>\n<root{}>\n'.format(
+                decls)
+
+        return '<?xml version="1.0" encoding="UTF-8"?>\n<root>\n'
+
+    def _words(self, num, count):
+        words = self.__WORDS
+        return ' '.join(words[(num + idx) % len(words)]
+                        for idx in range(count))
+
+    def _wide_record(self, num):
+        return '  <item id="{0}">value {0}</item>\n'.format(num), 1
+
+    def _deep_record(self, num):
+        opening = ''.join('<level n="{}">'.format(idx)
+                          for idx in range(self.DEPTH))
+        closing = '</level>' * self.DEPTH
+        return '  {}{}{}\n'.format(opening, num, closing), self.DEPTH
+
+    def _attributes_record(self, num):
+        attrs = ''.join(' a{0}="{1}-{0}"'.format(idx, num)
+                        for idx in range(self.ATTRIBUTES))
+        return '  <record{}/>\n'.format(attrs), 1
+
+    def _namespaces_record(self, num):
+        fields = ''.join('<n{0}:field>{1}</n{0}:field>'.format(idx, num)
+                         for idx in range(self.NAMESPACES))
+        prefix = num % self.NAMESPACES
+        return '  <n{0}:record>{1}</n{0}:record>\n'.format(
+            prefix, fields), self.NAMESPACES + 1
+
+    def _text_record(self, num):
+        return '  <para>{}</para>\n'.format(
+            self._words(num, self.TEXT_WORDS)), 1
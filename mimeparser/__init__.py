@@ -11,9 +11,33 @@ __email__ = 'carl.nobile@gmail.com'
 __license__ = 'MIT License'
 __credits__ = ''
 
-__all__ = ('MIMEParser',)
+__all__ = ('MIMEParser', 'BodyDecoder', 'UnsupportedMediaType')
 
-from .mimeparser import MIMEParser
+# The classes are only imported when first used so importing the package
+# stays fast, see __getattr__().
+_LAZY_IMPORTS = {
+    'MIMEParser': 'mimeparser',
+    'BodyDecoder': 'decoder',
+    'UnsupportedMediaType': 'decoder',
+    }
+
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(
+            __name__, name))
+
+    # A relative import of the module, unlike importlib this is also
+    # shown by python -X importtime.
+    value = getattr(__import__(module, globals(), None, (name,), 1), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
 
 __version_info__ = {
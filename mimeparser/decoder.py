@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#
+# mimeparser/decoder.py
+#
+# See MIT License file.
+#
+"""
+Decode request bodies with the decoder registered for their Content-Type.
+
+The Content-Type header is parsed with MIMEParser.parse_mime() and the
+result cached, so repeated headers are only parsed once. A decoder is
+found by trying, in order:
+ - type/subtype+suffix -- ie. application/atom+xml
+ - +suffix             -- ie. +xml, any type with that suffix.
+ - type/*
+ - */*
+
+Decoders are called with the body, the charset parameter or None and the
+dict of all parameters. The body is passed on as it is, bytes or any
+binary file like object with a read() method such as a WSGI input stream,
+so nothing is decoded to text first. The default XML decoder
+hands the charset to XML2Dict as the parser encoding, it takes precedence
+over the encoding in the XML declaration as RFC 7303 requires.
+
+A BodyDecoder can be shared by all request handlers, decode() can be
+called from any number of threads as XML2Dict keeps the state of each
+parse local to it.
+
+Example:
+  >>> decoder = BodyDecoder()
+  >>> decoder.decode('application/atom+xml; charset=utf-8', request.body)
+"""
+__docformat__ = "restructuredtext en"
+
+from functools import lru_cache
+
+from .mimeparser import MIMEParser
+
+# Importing the package is fast, XML2Dict is only imported when used.
+try:
+    import xml2dict as _xml2dict
+except ImportError:  # pragma: no cover
+    _xml2dict = None
+
+
+class UnsupportedMediaType(ValueError):
+    """
+    Raised when no decoder is registered for a Content-Type.
+    """
+    pass
+
+
+class BodyDecoder(object):
+    XML_TYPES = ('application/xml', 'text/xml', '+xml')
+    JSON_TYPES = ('application/json', '+json')
+
+    def __init__(self, xml2dict=None, defaults=True, cache_size=256):
+        self._mime_parser = MIMEParser()
+        self._parse_mime = lru_cache(maxsize=cache_size)(
+            self._mime_parser.parse_mime)
+        self._xml2dict = xml2dict
+        self._decoders = {}
+
+        if defaults:
+            if self._xml2dict is not None or _xml2dict is not None:
+                for media_type in self.XML_TYPES:
+                    self.register(media_type, self._decode_xml)
+
+            for media_type in self.JSON_TYPES:
+                self.register(media_type, self._decode_json)
+
+    def register(self, media_type, decoder):
+        """
+        Register `decoder` for `media_type` which can be a full media type,
+        a +suffix, type/* or */*. Parameters in `media_type` are ignored.
+        """
+        self._decoders[self._key(media_type)] = decoder
+
+    def parse_content_type(self, content_type):
+        """
+        Return the cached (type, subtype, suffix, params) of a
+        Content-Type, see MIMEParser.parse_mime(). The result is shared so
+        it must not be changed.
+        """
+        return self._parse_mime(content_type)
+
+    def find_decoder(self, content_type):
+        mtype, subtype, suffix, params = self.parse_content_type(
+            content_type)
+        keys = ((mtype, subtype, suffix), ('', '', suffix), (mtype, '*', ''),
+                ('*', '*', ''))
+
+        for key in keys:
+            decoder = self._decoders.get(key)
+
+            if decoder is not None:
+                return decoder
+
+        raise UnsupportedMediaType(
+            "No decoder for Content-Type: {}".format(content_type))
+
+    def decode(self, content_type, body):
+        """
+        Decode `body`, bytes or a binary file object, with the decoder for
+        `content_type`.
+        """
+        decoder = self.find_decoder(content_type)
+        # A copy so decoders can't change the cached params.
+        params = dict(self.parse_content_type(content_type)[3])
+        charset = params.get('charset')
+        return decoder(body, None if charset is None else str(charset),
+                       params)
+
+    def _key(self, media_type):
+        if media_type.startswith('+'):
+            return '', '', media_type[1:].strip().lower()
+
+        return self.parse_content_type(media_type)[:3]
+
+    def _decode_xml(self, body, charset, params):
+        if self._xml2dict is None:
+            self._xml2dict = _xml2dict.XML2Dict()
+
+        return self._xml2dict.parse(body, encoding=charset)
+
+    def _decode_json(self, body, charset, params):
+        import json
+
+        if hasattr(body, 'read'):
+            body = body.read()
+
+        # Without a charset json detects UTF-8, UTF-16 and UTF-32 itself.
+        if charset and isinstance(body, bytes):
+            body = body.decode(charset)
+
+        return json.loads(body)
@@ -28,13 +28,14 @@ Entry point:
 """
 __docformat__ = "restructuredtext en"
 
-from collections import OrderedDict
-from decimal import Decimal, InvalidOperation, getcontext
+# The decimal module is slow to import, it is only imported when a
+# MIMEParser is created.
 
 
 class MIMEParser(object):
 
     def __init__(self, parm_val_lower=True):
+        from decimal import getcontext
         self._parm_val_lower = parm_val_lower
         getcontext().prec = 4
 
@@ -93,8 +94,9 @@ class MIMEParser(object):
         All numeric values to any parameter are returned as a python
         Decimal object.
         """
+        from decimal import Decimal, InvalidOperation
         parts = mtype.split(';')
-        params = OrderedDict()
+        params = {}
 
         # Split parameters and convert numeric values to a Decimal object.
         for k, v in [param.split('=', 1) for param in parts[1:]]:
@@ -149,6 +151,7 @@ class MIMEParser(object):
         (quality) parameter of the best match, or (-1, Decimal("0.0")) if
         no match was found.
         """
+        from decimal import Decimal
         best_fit = -1
         best_fit_q = Decimal("0.0")
         best_params = 0
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_benchmarks.py
+#
+
+import io
+import unittest
+
+from xml2dict import XML2Dict
+from benchmarks.generators import DocumentGenerator
+from benchmarks.bench_xml2dict import Benchmark
+
+
+class TestDocumentGenerator(unittest.TestCase):
+
+    def __init__(self, name):
+        super(TestDocumentGenerator, self).__init__(name)
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_parse_size(self):
+        """
+        Test that sizes are converted to bytes.
+        """
+        sizes = (('64KB', 64 * 1024), ('10mb', 10 * 1024 ** 2),
+                 ('1G', 1024 ** 3), ('512', 512), ('1.5KB', 1536))
+
+        for size, expect in sizes:
+            found = DocumentGenerator.parse_size(size)
+            msg = "Found: {}, should be: {}".format(found, expect)
+            self.assertEqual(found, expect, msg)
+
+        with self.assertRaises(ValueError):
+            DocumentGenerator.parse_size('10 parsecs')
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_write(self):
+        """
+        Test that every shape writes a valid document of the requested size
+        with the reported number of elements.
+        """
+        def count(node):
+            return 1 + sum(count(child) for child in node['children'])
+
+        for shape in DocumentGenerator.SHAPES:
+            out = io.BytesIO()
+            nbytes, elements = DocumentGenerator(shape).write(out, '16KB')
+            msg = "shape: {}, bytes: {}, elements: {}".format(
+                shape, nbytes, elements)
+            self.assertEqual(nbytes, len(out.getvalue()), msg)
+            self.assertTrue(nbytes >= 16 * 1024, msg)
+            data = XML2Dict(strip_list=True).parse(io.BytesIO(out.getvalue()))
+            self.assertEqual(count(data), elements, msg)
+
+        with self.assertRaises(ValueError):
+            DocumentGenerator('round')
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def __init__(self, name):
+        super(TestBenchmark, self).__init__(name)
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_run(self):
+        """
+        Test that a small run measures every mode.
+        """
+        bench = Benchmark(shapes=('wide',), sizes=('4KB',), repeat=1,
+                          rss=False)
+        results = bench.run()
+        modes = [result['mode'] for result in results]
+        msg = "results: {}".format(results)
+        expect = ['parse', 'stats', 'lazy', 'iterparse', 'columns', 'dump']
+        self.assertEqual(modes, expect, msg)
+
+        for result in results:
+            self.assertTrue(result['mb_per_s'] > 0, msg)
+            self.assertTrue(result['tm_peak'] > 0, msg)
+
+        with self.assertRaises(ValueError):
+            Benchmark(modes=('nothing',))
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_compare(self):
+        """
+        Test that slower or larger results are flagged as regressions.
+        """
+        base = {'shape': 'wide', 'size': '1MB', 'mode': 'parse',
+                'mb_per_s': 10.0, 'tm_peak': 1000, 'rss_peak': None}
+        same = dict(base, mb_per_s=9.0, tm_peak=1100)
+        slow = dict(base, mb_per_s=5.0)
+        large = dict(base, tm_peak=2000)
+        other = dict(base, size='2MB', mb_per_s=1.0)
+        self.assertEqual(Benchmark.compare([same, other], [base]), [])
+        found = Benchmark.compare([slow, large], [base], threshold=0.2)
+        msg = "Found: {}".format(found)
+        self.assertEqual(len(found), 2, msg)
+        self.assertTrue('throughput' in found[0], msg)
+        self.assertTrue('tm_peak' in found[1], msg)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_cache.py
+#
+
+import io
+import os
+import shutil
+import functools
+import tempfile
+import unittest
+
+from xml2dict import XML2Dict, ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+    xsd = 'tests/FATCA-FFILIST-1.0.xsd'
+    simple = 'tests/simple.xml'
+
+    def __init__(self, name):
+        super(TestResultCache, self).__init__(name)
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_parse_cached(self):
+        """
+        Test that a second parse of the same XML is a cache hit returning
+        an equal copy.
+        """
+        cache = ResultCache()
+        x2d = XML2Dict(cache=cache)
+
+        with io.open(self.xsd, 'rb') as f:
+            first = x2d.parse(f)
+            second = x2d.parse(f)
+            expect = XML2Dict().parse(f)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertEqual(first, second)
+            self.assertEqual(first, expect)
+            # Changing a result does not change the cache.
+            second[0]['attrib']['changed'] = True
+            self.assertEqual(x2d.parse(f), first)
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_options_in_key(self):
+        """
+        Test that different options, hooks and content are different keys.
+        """
+        class HookXML2Dict(XML2Dict):
+            def value_hook(self, value):
+                return value.upper() if value else value
+
+        cache = ResultCache()
+        xml = '<a><b>text</b></a>'
+        XML2Dict(cache=cache).parse(xml)
+        XML2Dict(cache=cache, strip_list=True).parse(xml)
+        XML2Dict(cache=cache, exclude=['b']).parse(xml)
+        data = HookXML2Dict(cache=cache).parse(xml)
+        XML2Dict(cache=cache).parse(xml.encode('utf-8'))
+        XML2Dict(cache=cache).parse('<a><b>other</b></a>')
+        self.assertEqual((cache.hits, cache.misses), (0, 6))
+        value = data[0]['children'][0]['element']['value']
+        self.assertEqual(value, 'TEXT')
+        XML2Dict(cache=cache, strip_list=True).parse(xml)
+        self.assertEqual(cache.hits, 1)
+        # Lazy mode does not use the cache.
+        XML2Dict(cache=cache, lazy=True).parse(xml)
+        self.assertEqual((cache.hits, cache.misses), (1, 6))
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_hook_identity(self):
+        """
+        Test that results of different hooks with the same name are not
+        mixed up.
+        """
+        def make(num):
+            class Repeat(XML2Dict):
+                def value_hook(self, value):
+                    return value * num if value else value
+
+            return Repeat
+
+        class Unit(XML2Dict):
+            def __init__(self, unit, **kwargs):
+                super(Unit, self).__init__(**kwargs)
+                self.unit = unit
+
+            def value_hook(self, value):
+                return value + self.unit if value else value
+
+        def suffix(text, value):
+            return value + text if value else value
+
+        cache = ResultCache()
+        xml = '<a>x</a>'
+        kwargs = {'cache': cache, 'strip_list': True}
+
+        def value(x2d):
+            return x2d.parse(xml)['element']['value']
+
+        def hooked(hook):
+            x2d = XML2Dict(**kwargs)
+            x2d.value_hook = hook
+            return x2d
+
+        cases = (
+            (make(2)(**kwargs), make(3)(**kwargs), ('xx', 'xxx')),
+            (hooked(lambda v: 'A'), hooked(lambda v: 'B'), ('A', 'B')),
+            (Unit('kg', **kwargs), Unit('lb', **kwargs), ('xkg', 'xlb')),
+            (hooked(functools.partial(suffix, '1')),
+             hooked(functools.partial(suffix, '2')), ('x1', 'x2')),
+            )
+
+        for x2d_a, x2d_b, expect in cases:
+            found = value(x2d_a), value(x2d_b)
+            msg = "Found: {}, should be: {}".format(found, expect)
+            self.assertEqual(found, expect, msg)
+
+        # The same hook object is still a hit.
+        misses = cache.misses
+        x2d = Unit('kg', **kwargs)
+        self.assertEqual((value(x2d), value(x2d)), ('xkg', 'xkg'))
+        self.assertEqual((cache.hits, cache.misses), (1, misses + 1))
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_hook_key_directory(self):
+        """
+        Test that results of a hook are only cached on disk when it has a
+        value_hook_key().
+        """
+        class Upper(XML2Dict):
+            def value_hook(self, value):
+                return value.upper() if value else value
+
+        class KeyedUpper(Upper):
+            def value_hook_key(self):
+                return 'upper'
+
+        xml = '<a>x</a>'
+
+        for cls, files, hits in ((Upper, 0, 0), (KeyedUpper, 1, 1)):
+            Upper(cache=ResultCache(directory=self.directory)).parse(xml)
+            cache = ResultCache(directory=self.directory)
+            cls(cache=cache).parse(xml)
+            cache = ResultCache(directory=self.directory)
+            data = cls(cache=cache).parse(xml)
+            found = (len(os.listdir(self.directory)), cache.hits)
+            msg = "{}: found: {}, should be: {}".format(
+                cls.__name__, found, (files, hits))
+            self.assertEqual(found, (files, hits), msg)
+            self.assertEqual(data[0]['element']['value'], 'X', msg)
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_stats_cached(self):
+        """
+        Test that a cache hit collects stats marked as cached and calls
+        stats_hook().
+        """
+        class StatsXML2Dict(XML2Dict):
+            def stats_hook(self, stats):
+                self.found.append(stats)
+
+        x2d = StatsXML2Dict(cache=ResultCache(), stats=True)
+        x2d.found = []
+
+        with io.open(self.simple, 'rb') as f:
+            x2d.parse(f)
+            x2d.parse(f)
+            size = f.tell()
+
+        first, second = x2d.found
+        msg = "Found: {}, {}".format(first, second)
+        self.assertTrue(second is x2d.last_stats, msg)
+        self.assertEqual((first.cached, second.cached), (False, True), msg)
+        self.assertEqual(second.bytes_read, size, msg)
+        self.assertEqual((second.elements, second.parser_time), (0, 0), msg)
+        self.assertTrue(second.build_time > 0, msg)
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_lru(self):
+        """
+        Test that the least recently used results are dropped.
+        """
+        cache = ResultCache(maxsize=2)
+        x2d = XML2Dict(cache=cache)
+
+        for xml in ('<a/>', '<b/>', '<a/>', '<c/>', '<a/>', '<b/>'):
+            x2d.parse(xml)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_directory(self):
+        """
+        Test that results on disk are found by a new cache and that clear()
+        removes them.
+        """
+        with io.open(self.simple, 'rb') as f:
+            expect = XML2Dict(cache=ResultCache(
+                directory=self.directory)).parse(f)
+            cache = ResultCache(maxsize=0, directory=self.directory)
+            data = XML2Dict(cache=cache).parse(f)
+
+        self.assertEqual(data, expect)
+        self.assertEqual(cache.hits, 1)
+        cache.clear()
+
+        with io.open(self.simple, 'rb') as f:
+            XML2Dict(cache=cache).parse(f)
+
+        self.assertEqual(cache.misses, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_decoder.py
+#
+
+import io
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from mimeparser import BodyDecoder, UnsupportedMediaType
+from xml2dict import XML2Dict
+
+
+class Stream(object):
+    """
+    A file like object that can't seek, like a WSGI input.
+    """
+
+    def __init__(self, data):
+        self._data = io.BytesIO(data)
+
+    def read(self, size=-1):
+        return self._data.read(size)
+
+
+class TestBodyDecoder(unittest.TestCase):
+    xml = ('<?xml version="1.0" encoding="UTF-8"?>'
+           '<a>caf\xe9</a>').encode('latin-1')
+
+    def __init__(self, name):
+        super(TestBodyDecoder, self).__init__(name)
+
+    def setUp(self):
+        self.decoder = BodyDecoder()
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_decode_xml(self):
+        """
+        Test that XML types, including +xml, are decoded with the charset
+        taking precedence over the XML declaration.
+        """
+        for mtype in ('application/xml', 'text/xml',
+                      'application/atom+xml', 'Application/VND.Corp+XML'):
+            data = self.decoder.decode(mtype + '; charset=ISO-8859-1',
+                                       self.xml)
+            value = data[0]['element']['value']
+            msg = "Content-Type: {}, found: {}".format(mtype, value)
+            self.assertEqual(value, 'caf\xe9', msg)
+
+        data = self.decoder.decode('text/xml; charset=iso-8859-1',
+                                   Stream(self.xml))
+        self.assertEqual(data[0]['element']['value'], 'caf\xe9')
+
+        with io.open('tests/simple.xml', 'rb') as f:
+            data = self.decoder.decode('application/xml', f)
+
+        self.assertEqual(data[0]['element']['tag'], 'breakfast-menu')
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_decode_threads(self):
+        """
+        Test that one decoder can decode bodies from many threads.
+        """
+        # Large enough to be read in many chunks.
+        bodies = ['<r{0}>{1}</r{0}>'.format(
+            n, '<i>{}</i>'.format(n) * 20000).encode('utf-8')
+            for n in range(8)]
+
+        def decode(n):
+            data = self.decoder.decode('application/xml; charset=utf-8',
+                                       Stream(bodies[n]))
+            return (data[0]['element']['tag'], len(data[0]['children']),
+                    data[0]['children'][-1]['element']['value'])
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            found = list(executor.map(decode, range(8)))
+
+        expect = [('r{}'.format(n), 20000, str(n)) for n in range(8)]
+        msg = "Found: {}, should be: {}".format(found, expect)
+        self.assertEqual(found, expect, msg)
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_decode_json(self):
+        """
+        Test that JSON types are decoded.
+        """
+        data = self.decoder.decode('application/vnd.corp+json',
+                                   Stream(b'{"a": 1}'))
+        self.assertEqual(data, {'a': 1})
+        data = self.decoder.decode('application/json; charset=latin-1',
+                                   '{"a": "caf\xe9"}'.encode('latin-1'))
+        self.assertEqual(data, {'a': 'caf\xe9'})
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_register(self):
+        """
+        Test that registered decoders are found in order and that the
+        parsed Content-Type is cached.
+        """
+        found = []
+        decoder = BodyDecoder(xml2dict=XML2Dict(strip_list=True))
+        decoder.register('text/*', lambda b, c, p: found.append(('text', c)))
+        decoder.register('*', lambda b, c, p: found.append(('any', c)))
+        decoder.register('text/xml', lambda b, c, p: found.append(('xml', p)))
+        decoder.decode('text/plain; charset=UTF-8', b'')
+        decoder.decode('image/png', b'')
+        decoder.decode('text/xml; level=1', b'')
+        data = decoder.decode('application/atom+xml', b'<a/>')
+        expect = [('text', 'utf-8'), ('any', None),
+                  ('xml', {'level': 1, 'q': 1})]
+        msg = "Found: {}, should be: {}".format(found, expect)
+        self.assertEqual(found, expect, msg)
+        self.assertEqual(data['element']['tag'], 'a')
+        first = decoder.parse_content_type('text/html; level=1')
+        self.assertTrue(first is decoder.parse_content_type(
+            'text/html; level=1'))
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_unsupported(self):
+        """
+        Test that an unknown Content-Type raises UnsupportedMediaType.
+        """
+        with self.assertRaises(UnsupportedMediaType):
+            self.decoder.decode('text/plain', b'')
+
+        with self.assertRaises(UnsupportedMediaType):
+            BodyDecoder(defaults=False).decode('application/xml', b'<a/>')
+
+
+if __name__ == '__main__':
+    unittest.main()
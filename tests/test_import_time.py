@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_import_time.py
+#
+
+import sys
+import unittest
+import subprocess
+
+from benchmarks.bench_import import (
+    ROOT, BUDGET_MS, STATEMENTS, ImportBenchmark, import_times)
+
+
+class TestImportTime(unittest.TestCase):
+    HEAVY_MODULES = ('defusedxml', 'xml.etree.ElementTree', 'decimal',
+                     'logging', 're', 'json', 'six')
+
+    def __init__(self, name):
+        super(TestImportTime, self).__init__(name)
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_no_heavy_imports(self):
+        """
+        Test that importing the packages does not import the modules that
+        are only needed when they are used.
+        """
+        stmt = ("import sys, xml2dict, mimeparser; "
+                "print(' '.join(m for m in {!r} if m in sys.modules))").format(
+                    self.HEAVY_MODULES)
+        found = subprocess.check_output(
+            [sys.executable, '-c', stmt], cwd=ROOT,
+            universal_newlines=True).strip()
+        msg = "Found: {!r}, should be: ''".format(found)
+        self.assertEqual(found, '', msg)
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_import_budget(self):
+        """
+        Test that importing the packages stays within the budget.
+        """
+        bench = ImportBenchmark(statements={'import': STATEMENTS['import']},
+                                repeat=3)
+        result = bench.run()[0]
+        msg = "Found: {:.2f} ms, should be under: {} ms, slowest: {}".format(
+            result['total_ms'], BUDGET_MS, result['slowest'])
+        self.assertTrue(result['total_ms'] < BUDGET_MS, msg)
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_import_times(self):
+        """
+        Test that the -X importtime output is parsed.
+        """
+        times = import_times("import xml2dict; xml2dict.XML2Dict")
+        modules = [module for depth, s, c, module in times]
+        msg = "Found: {}".format(modules)
+        self.assertTrue('xml2dict' in modules, msg)
+        self.assertTrue('xml2dict.xml2dict' in modules, msg)
+
+        for depth, self_us, cumul_us, module in times:
+            self.assertTrue(depth >= 0 and 0 <= self_us <= cumul_us, msg)
+
+        with self.assertRaises(RuntimeError):
+            import_times("import no_such_module")
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_lazy_attributes(self):
+        """
+        Test that the package attributes are imported on first use.
+        """
+        import xml2dict
+        import mimeparser
+        from xml2dict.xml2dict import XML2Dict
+        from mimeparser.decoder import BodyDecoder
+
+        self.assertIs(xml2dict.XML2Dict, XML2Dict)
+        self.assertIs(mimeparser.BodyDecoder, BodyDecoder)
+        self.assertTrue('ResultCache' in dir(xml2dict))
+
+        with self.assertRaises(AttributeError):
+            xml2dict.NoSuchClass
+
+
+if __name__ == '__main__':
+    unittest.main()
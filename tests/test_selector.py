@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_selector.py
+#
+
+import unittest
+
+from xml2dict import Selector
+
+
+class TestSelector(unittest.TestCase):
+    XSD = 'http://www.w3.org/2001/XMLSchema'
+
+    def __init__(self, name):
+        super(TestSelector, self).__init__(name)
+
+    def walk(self, selector, path):
+        """
+        Step through a path of (nspace, name) tuples returning the
+        actions.
+        """
+        state = selector.initial()
+        actions = []
+
+        for nspace, name in path:
+            action, state = selector.step(state, nspace, name)
+            actions.append(action)
+
+            if action == Selector.SKIP:
+                break
+
+        return actions
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_absolute_path(self):
+        """
+        Test that an absolute path starts at the root element.
+        """
+        sel = Selector(include=['/a/b'])
+        actions = self.walk(sel, [('', 'a'), ('', 'b'), ('', 'c')])
+        expect = [Selector.PENDING, Selector.KEEP, Selector.KEEP]
+        msg = "Found: {}, should be: {}".format(actions, expect)
+        self.assertEqual(actions, expect, msg)
+        actions = self.walk(sel, [('', 'x'), ('', 'a'), ('', 'b')])
+        expect = [Selector.SKIP]
+        msg = "Found: {}, should be: {}".format(actions, expect)
+        self.assertEqual(actions, expect, msg)
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_relative_and_descendant_paths(self):
+        """
+        Test that relative paths and // can match at any depth.
+        """
+        sel = Selector(include=['b//d'])
+        actions = self.walk(sel, [('', 'a'), ('', 'b'), ('', 'c'), ('', 'd')])
+        expect = [Selector.PENDING, Selector.PENDING, Selector.PENDING,
+                  Selector.KEEP]
+        msg = "Found: {}, should be: {}".format(actions, expect)
+        self.assertEqual(actions, expect, msg)
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_exclude(self):
+        """
+        Test that excluded elements are skipped even inside an included
+        subtree.
+        """
+        sel = Selector(include=['/a'], exclude=['c'])
+        actions = self.walk(sel, [('', 'a'), ('', 'b'), ('', 'c')])
+        expect = [Selector.KEEP, Selector.KEEP, Selector.SKIP]
+        msg = "Found: {}, should be: {}".format(actions, expect)
+        self.assertEqual(actions, expect, msg)
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_namespaces(self):
+        """
+        Test prefixed, Clark notation and wildcard steps.
+        """
+        path = [(self.XSD, 'schema'), (self.XSD, 'element')]
+        keep = [Selector.PENDING, Selector.KEEP]
+        selectors = (
+            Selector(include=['/xsd:schema/xsd:element'],
+                     namespaces={'xsd': self.XSD}),
+            Selector(include=['/{%s}schema/{*}element' % self.XSD]),
+            Selector(include=['/*/{%s}*' % self.XSD]),
+            Selector(include=['/schema/element'],
+                     namespaces={'': self.XSD}),
+            )
+
+        for sel in selectors:
+            actions = self.walk(sel, path)
+            msg = "Found: {}, should be: {}".format(actions, keep)
+            self.assertEqual(actions, keep, msg)
+
+        # No prefix means no namespace.
+        actions = self.walk(Selector(include=['/schema']), path)
+        msg = "Found: {}, should be: {}".format(actions, [Selector.SKIP])
+        self.assertEqual(actions, [Selector.SKIP], msg)
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_invalid_paths(self):
+        """
+        Test that invalid paths raise a ValueError.
+        """
+        for path in ('', '/', 'a/', '///a', 'a///b', '{u}a{v}b', '{u}',
+                     'p:a'):
+            with self.assertRaises(ValueError):
+                Selector(include=[path])
+
+
+if __name__ == '__main__':
+    unittest.main()
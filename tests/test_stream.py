@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_stream.py
+#
+
+import io
+import os
+import json
+import tempfile
+import unittest
+
+from xml2dict import XML2Dict
+from xml2dict.stream import XML2JSON, main
+
+
+class TestXML2JSON(unittest.TestCase):
+    xsd = 'tests/FATCA-FFILIST-1.0.xsd'
+    simple = 'tests/simple.xml'
+
+    def __init__(self, name):
+        super(TestXML2JSON, self).__init__(name)
+
+    def run_main(self, *args):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+
+        try:
+            ret = main(list(args) + ['-o', path])
+
+            with io.open(path, 'r') as f:
+                output = f.read()
+        finally:
+            os.remove(path)
+
+        return ret, output
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_dump(self):
+        """
+        Test that the streamed JSON is the same as dumping the parsed
+        structure.
+        """
+        options = ({}, {'strip_list': True}, {'include': ['food/price']},
+                   {'exclude': ['/breakfast-menu'], 'strip_list': True})
+
+        for kwargs in options:
+            with io.open(self.simple, 'rb') as f:
+                out = io.StringIO()
+                XML2JSON(**kwargs).dump(f, out)
+                expect = json.dumps(XML2Dict(**kwargs).parse(f))
+
+            msg = "options: {}, found: {}, should be: {}".format(
+                kwargs, out.getvalue(), expect)
+            self.assertEqual(out.getvalue(), expect, msg)
+
+        with io.open(self.xsd, 'r') as f:
+            out = io.StringIO()
+            XML2JSON().dump(f, out)
+            expect = json.dumps(XML2Dict().parse(f))
+
+        self.assertEqual(out.getvalue(), expect)
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_dump_records(self):
+        """
+        Test that one line is written for each record.
+        """
+        out = io.StringIO()
+        x2j = XML2JSON(exclude=['description'])
+
+        with io.open(self.simple, 'rb') as f:
+            x2j.dump_records(f, out, 'food')
+
+        lines = out.getvalue().splitlines()
+        msg = "Found lines: {}".format(lines)
+        self.assertEqual(len(lines), 5, msg)
+        record = json.loads(lines[0])
+        tags = [child['element']['tag'] for child in record['children']]
+        self.assertEqual(tags, ['name', 'price', 'calories'], msg)
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_main(self):
+        """
+        Test the command line tool.
+        """
+        ret, output = self.run_main('-s', '-i', 'food/name', self.simple)
+        self.assertEqual(ret, 0)
+        data = json.loads(output)
+        msg = "data: {}".format(data)
+        self.assertEqual(data['element']['tag'], 'breakfast-menu', msg)
+        ret, output = self.run_main(
+            '-n', 'xsd=http://www.w3.org/2001/XMLSchema',
+            '-r', '/xsd:schema/xsd:element', '-x', 'xsd:annotation',
+            self.xsd)
+        self.assertEqual(ret, 0)
+        names = [json.loads(line)['attrib']['name']
+                 for line in output.splitlines()]
+        self.assertTrue('IRSFFIList' in names, names)
+
+    #@unittest.skip("Temporarily skipped.")
+    def test_main_errors(self):
+        """
+        Test that bad arguments and bad XML are reported.
+        """
+        with self.assertRaises(SystemExit):
+            self.run_main('-i', 'p:a', self.simple)
+
+        with self.assertRaises(SystemExit):
+            self.run_main('-n', 'xsd', self.simple)
+
+        with self.assertRaises(SystemExit):
+            self.run_main('-e', 'bogus', self.simple)
+
+        fd, path = tempfile.mkstemp()
+        os.write(fd, b'<?xml version="1.0"?>\n<root')
+        os.close(fd)
+
+        try:
+            ret, output = self.run_main(path)
+        finally:
+            os.remove(path)
+
+        # Nothing is written before the root element starts.
+        msg = "Found: {}, {!r}, should be: 1, ''".format(ret, output)
+        self.assertEqual((ret, output), (1, ''), msg)
+
+
+if __name__ == '__main__':
+    unittest.main()
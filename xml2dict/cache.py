@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+#
+# xml2dict/cache.py
+#
+# See MIT License file.
+#
+"""
+Cache of XML2Dict results keyed by a hash of the XML and the options.
+
+Results are kept serialized, a pickle in memory and a zlib compressed
+pickle on disk, so every hit returns a new copy and callers can never
+change what is cached. Only use a directory that nobody else can write
+to, unpickling data from an untrusted source is not safe.
+
+Results that depend on objects which can't be part of a key, such as a
+value_hook without a value_hook_key(), are passed with those objects as
+`refs`. They are only cached in memory and only found again for the very
+same objects, which the cache keeps alive until the result is dropped.
+"""
+__docformat__ = "restructuredtext en"
+
+import os
+import zlib
+import pickle
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+class ResultCache(object):
+    """
+    An LRU cache of up to `maxsize` results in memory with an optional
+    second layer in `directory`. One cache can be shared by any number of
+    XML2Dict objects, the options are part of the key.
+    """
+    __SUFFIX = '.pkl.z'
+
+    def __init__(self, maxsize=128, directory=None):
+        self._maxsize = maxsize
+        self._directory = directory
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    @staticmethod
+    def make_key(content, options):
+        """
+        Return the key for `content`, the XML as bytes or str, parsed with
+        `options`, a tuple of reprs of the options.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(options).encode('utf-8'))
+        digest.update(b'\0')
+
+        if isinstance(content, bytes):
+            digest.update(b'b')
+            digest.update(content)
+        else:
+            digest.update(b's')
+            digest.update(content.encode('utf-8', 'surrogatepass'))
+
+        return digest.hexdigest()
+
+    def get(self, key, refs=()):
+        """
+        Return a copy of the cached result or None if there is none.
+        """
+        mkey = self._memory_key(key, refs)
+
+        with self._lock:
+            entry = self._memory.get(mkey)
+
+            if entry is not None:
+                self._memory.move_to_end(mkey)
+
+        blob = None if entry is None else entry[1]
+
+        if blob is None and self._directory and not refs:
+            blob = self._read(key)
+
+            if blob is not None:
+                self._remember(mkey, refs, blob)
+
+        with self._lock:
+            if blob is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return None if blob is None else pickle.loads(blob)
+
+    def set(self, key, data, refs=()):
+        """
+        Cache `data` under `key`, only in memory when `refs` are given.
+        """
+        blob = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(self._memory_key(key, refs), refs, blob)
+
+        if self._directory and not refs:
+            self._write(key, blob)
+
+    def clear(self):
+        """
+        Remove every result from memory and disk.
+        """
+        with self._lock:
+            self._memory.clear()
+
+        if self._directory:
+            for name in os.listdir(self._directory):
+                if name.endswith(self.__SUFFIX):
+                    os.remove(os.path.join(self._directory, name))
+
+    def __len__(self):
+        return len(self._memory)
+
+    def _memory_key(self, key, refs):
+        # The ids can't be reused while the entry keeps the refs alive.
+        return (key,) + tuple(id(ref) for ref in refs) if refs else key
+
+    def _remember(self, mkey, refs, blob):
+        with self._lock:
+            self._memory[mkey] = (tuple(refs), blob)
+            self._memory.move_to_end(mkey)
+
+            while len(self._memory) > self._maxsize:
+                self._memory.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self._directory, key + self.__SUFFIX)
+
+    def _read(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                return zlib.decompress(f.read())
+        except (IOError, OSError, zlib.error):
+            return None
+
+    def _write(self, key, blob):
+        # Write to a temporary file first so readers never see part of it.
+        fd, path = tempfile.mkstemp(dir=self._directory)
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(zlib.compress(blob))
+
+            os.replace(path, self._path(key))
+        except (IOError, OSError):
+            if os.path.exists(path):
+                os.remove(path)
+
+            raise
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+#
+# xml2dict/columnar.py
+#
+# See MIT License file.
+#
+"""
+Extract repeated records from XML into columns in one streaming pass.
+
+Each record is an element matching the record selector path and each
+column a field of the record given by a simple path relative to it:
+ - name      -- The value of the record's child element `name`.
+ - a/p:b     -- The value of a deeper element, prefixes and Clark
+                notation work as in selectors.
+ - @id       -- An attribute of the record, only a prefix or Clark
+                notation gives it a namespace.
+ - a/@id     -- An attribute of a child element.
+ - .         -- The value of the record element itself.
+
+Values are converted by `value_hook` and whitespace removed the same as
+the `value` of the XML2Dict element dict. A column is a list, or an
+`array.array` when a typecode is given for it in which case the value is
+converted with float() or int(). The first value found in a record is
+used, a missing value is None, or NaN in float arrays. The result is a
+dict of columns so it can be passed as is to most analytics tools, for
+example pandas.DataFrame(columns).
+"""
+__docformat__ = "restructuredtext en"
+
+from array import array
+
+from .selector import Selector
+
+
+class _ColumnFrame(object):
+    __slots__ = ('state', 'key', 'parts')
+
+    def __init__(self, state, key):
+        self.state = state
+        self.key = key
+        self.parts = None
+
+
+class _ColumnTarget(object):
+    """
+    Parser target that fills the columns without building any element.
+    """
+    __FLOAT_CODES = ('f', 'd')
+
+    def __init__(self, converter, selector, fields, types=None,
+                 namespaces=None):
+        self._converter = converter
+        self._value_hook = converter.value_hook
+        self._selector = selector
+        self._stack = []
+        self._skip = 0
+        self._record_depth = None
+        self._values = None
+        self._types = types or {}
+        # Element path => column names, element path => [(attr, column)]
+        self._text_fields = {}
+        self._attr_fields = {}
+        self.columns = {}
+        self.nodes = 0
+        splitter = Selector(namespaces=namespaces)
+        # Unprefixed attributes are never in the default namespace.
+        attr_splitter = Selector(namespaces={
+            prefix: uri for prefix, uri in (namespaces or {}).items()
+            if prefix})
+
+        for name, path in fields.items():
+            head, sep, attr = path.rpartition('@')
+
+            if sep:
+                if head and not head.endswith('/'):
+                    raise ValueError("Invalid field path: {!r}".format(path))
+
+                key = splitter.split_path(head.rstrip('/'))
+                attr = attr_splitter.split_path(attr)
+
+                if len(attr) != 1:
+                    raise ValueError("Invalid field path: {!r}".format(path))
+
+                nspace, local = attr[0]
+                attr = "{{{}}}{}".format(nspace, local) if nspace else local
+                self._attr_fields.setdefault(key, []).append((attr, name))
+            else:
+                key = splitter.split_path(path)
+                self._text_fields.setdefault(key, []).append(name)
+
+            typecode = self._types.get(name)
+            self.columns[name] = array(typecode) if typecode else []
+
+        for name in self._types:
+            if name not in fields:
+                raise ValueError("Type given for unknown field: {!r}".format(
+                    name))
+
+    def start(self, tag, attrib):
+        if self._skip:
+            self._skip += 1
+            return
+
+        stack = self._stack
+
+        if stack:
+            parent = stack[-1]
+            self._end_text(parent)
+            state = parent.state
+        else:
+            parent = None
+            state = self._selector.initial()
+
+        nspace, name = self._converter._split_namespace(tag)
+        action, state = self._selector.step(state, nspace, name)
+
+        if action == Selector.SKIP:
+            self._skip = 1
+            return
+
+        key = None
+
+        if self._record_depth is not None:
+            key = parent.key + ((nspace, name),)
+        elif action == Selector.KEEP:
+            self._record_depth = len(stack)
+            self._values = {}
+            key = ()
+
+        frame = _ColumnFrame(state, key)
+        stack.append(frame)
+
+        if key is not None:
+            for attr, column in self._attr_fields.get(key, ()):
+                if column not in self._values and attr in attrib:
+                    self._values[column] = self._value_hook(attrib[attr])
+
+            columns = self._text_fields.get(key)
+
+            if columns and any(c not in self._values for c in columns):
+                frame.parts = []
+
+    def data(self, text):
+        if not self._skip and self._stack:
+            parts = self._stack[-1].parts
+
+            if parts is not None:
+                parts.append(text)
+
+    def end(self, tag):
+        if self._skip:
+            self._skip -= 1
+            return
+
+        frame = self._stack.pop()
+        self._end_text(frame)
+
+        if len(self._stack) == self._record_depth:
+            self._end_record()
+
+    def close(self):
+        return self.columns
+
+    @property
+    def peak_nodes(self):
+        # Every record adds a value to each column and all are kept.
+        return self.nodes * len(self.columns)
+
+    def _end_text(self, frame):
+        parts = frame.parts
+
+        if parts is not None:
+            frame.parts = None
+            converter = self._converter
+            text = self._value_hook(''.join(parts) if parts else None)
+            value = converter._tag_value(text)
+
+            for column in self._text_fields[frame.key]:
+                self._values.setdefault(column, value)
+
+    def _end_record(self):
+        values = self._values
+        num = len(next(iter(self.columns.values()), ()))
+
+        for column, data in self.columns.items():
+            value = values.get(column)
+            typecode = self._types.get(column)
+
+            if typecode in self.__FLOAT_CODES:
+                data.append(float('nan') if value in (None, '')
+                            else float(value))
+            elif typecode:
+                if value in (None, ''):
+                    raise ValueError(
+                        "Record {} has no value for the integer column "
+                        "{!r}".format(num, column))
+
+                data.append(int(value))
+            else:
+                data.append(value)
+
+        self.nodes += 1
+        self._record_depth = None
+        self._values = None
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+#
+# xml2dict/lazy.py
+#
+# See MIT License file.
+#
+"""
+Read-only views of the XML2Dict structure that convert each element the
+first time it is accessed.
+
+The XML is parsed into a plain ElementTree and the `attrib`, `element` and
+`children` values of a node are only built, then cached, when they are
+read. The `value_hook` is therefore called when a value is first read
+instead of during the parse.
+"""
+__docformat__ = "restructuredtext en"
+
+from types import MappingProxyType
+from collections.abc import Mapping, Sequence
+from xml.etree.ElementTree import TreeBuilder
+
+from .selector import Selector
+
+
+class _TreeFrame(object):
+    __slots__ = ('element', 'state', 'pending', 'has_child')
+
+    def __init__(self, element, state, pending):
+        self.element = element
+        self.state = state
+        self.pending = pending
+        self.has_child = False
+
+
+class _TreeTarget(object):
+    """
+    Parser target that builds an ElementTree without the subtrees skipped
+    by the selector. Tails are never used so they are not kept.
+    """
+
+    def __init__(self, converter, selector=None):
+        self._converter = converter
+        self._selector = selector
+        self._builder = TreeBuilder()
+        self._stack = []
+        self._skip = 0
+        self._root_skipped = False
+        self.nodes = 0
+        self.peak_nodes = 0
+
+    def start(self, tag, attrib):
+        if self._skip:
+            self._skip += 1
+            return
+
+        stack = self._stack
+        selector = self._selector
+
+        if stack:
+            parent = stack[-1]
+            parent.has_child = True
+            state = parent.state
+        else:
+            state = selector.initial() if selector else None
+
+        action = Selector.KEEP
+
+        if selector:
+            nspace, name = self._converter._split_namespace(tag)
+            action, state = selector.step(state, nspace, name)
+
+            if action == Selector.SKIP:
+                self._skip = 1
+                self._root_skipped = not stack
+                return
+
+            if action == Selector.KEEP:
+                # Pending ancestors are needed now.
+                for frame in reversed(stack):
+                    if not frame.pending:
+                        break
+
+                    frame.pending = False
+
+        element = self._builder.start(tag, attrib)
+        self.nodes += 1
+
+        # Pending elements are removed again so the peak can be higher.
+        if self.nodes > self.peak_nodes:
+            self.peak_nodes = self.nodes
+        stack.append(_TreeFrame(element, state,
+                                action == Selector.PENDING))
+
+    def data(self, text):
+        # Only the text before the first child is kept.
+        if not self._skip and self._stack and not self._stack[-1].has_child:
+            self._builder.data(text)
+
+    def end(self, tag):
+        if self._skip:
+            self._skip -= 1
+            return
+
+        frame = self._stack.pop()
+        self._builder.end(tag)
+
+        # A pending element is always the last child of its parent.
+        if frame.pending:
+            self.nodes -= 1
+
+            if self._stack:
+                del self._stack[-1].element[-1]
+            else:
+                self._root_skipped = True
+
+    def close(self):
+        root = self._builder.close()
+        return [] if self._root_skipped or root is None else [root]
+
+
+class LazyNode(Mapping):
+    """
+    A read-only mapping with the `attrib`, `element` and `children` keys of
+    an XML2Dict node. Each value is built on first access.
+    """
+    __slots__ = ('_converter', '_element', '_cache')
+    __KEYS = ('attrib', 'element', 'children')
+
+    def __init__(self, converter, element):
+        self._converter = converter
+        self._element = element
+        self._cache = {}
+
+    def __getitem__(self, key):
+        cache = self._cache
+
+        if key not in cache:
+            if key == 'attrib':
+                cache[key] = self._attrib()
+            elif key == 'element':
+                cache[key] = self._tag()
+            elif key == 'children':
+                cache[key] = LazyList(self._converter, self._element)
+            else:
+                raise KeyError(key)
+
+        return cache[key]
+
+    def __iter__(self):
+        return iter(self.__KEYS)
+
+    def __len__(self):
+        return len(self.__KEYS)
+
+    def __repr__(self):
+        return "{{'attrib': {!r}, 'element': {!r}, 'children': {!r}}}".format(
+            dict(self['attrib']), dict(self['element']), self['children'])
+
+    def _attrib(self):
+        value_hook = self._converter.value_hook
+        return MappingProxyType({k: value_hook(v)
+                                 for k, v in self._element.attrib.items()})
+
+    def _tag(self):
+        converter = self._converter
+        nspace, name = converter._split_namespace(self._element.tag)
+        text = converter.value_hook(self._element.text)
+        return MappingProxyType({'nspace': nspace,
+                                 'tag': name,
+                                 'value': converter._tag_value(text)})
+
+
+class LazyList(Sequence):
+    """
+    A read-only sequence of LazyNode objects, each is made on first access.
+    """
+    __slots__ = ('_converter', '_elements', '_cache')
+
+    def __init__(self, converter, elements):
+        self._converter = converter
+        self._elements = elements
+        self._cache = [None] * len(elements)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+
+        node = self._cache[idx]
+
+        if node is None:
+            node = LazyNode(self._converter, self._elements[idx])
+            self._cache[idx] = node
+
+        return node
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other))
+
+    def __repr__(self):
+        return repr(list(self))
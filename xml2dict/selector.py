@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+#
+# xml2dict/selector.py
+#
+# See MIT License file.
+#
+"""
+Include/exclude path selectors used by XML2Dict while parsing.
+
+Path syntax:
+ - /a/b     -- Absolute path, the first step is the root element.
+ - //a/b    -- The first step can be at any depth.
+ - a/b      -- Same as //a/b.
+ - a//b     -- b can be at any depth below a.
+ - *        -- Any element in any namespace.
+ - p:tag    -- Namespace prefix resolved with the `namespaces` argument.
+ - {uri}tag -- Clark notation, {*}tag matches tag in any namespace and
+               {uri}* any element in that namespace.
+
+A step without a prefix only matches elements without a namespace unless a
+default namespace is given with the '' key in `namespaces`, the same as
+ElementTree's ElementPath.
+"""
+__docformat__ = "restructuredtext en"
+
+
+class Selector(object):
+    """
+    Decides, one element at a time, what XML2Dict does with a subtree.
+
+    The state for each element is derived from its parent's state, so
+    deciding on an element never looks at more than the current path.
+    """
+    SKIP = 0
+    KEEP = 1
+    PENDING = 2
+
+    __CHILD = 0
+    __DESCENDANT = 1
+    __TOKEN_REGEX = r"(?P<sep>//?)|(?P<step>\{[^}]*\}[^/{}]*|[^/{}]+)"
+    __TOKEN_OBJ = None
+    __STEP_REGEX = (r"^(?:\{(?P<uri>[^}]*)\}|(?P<prefix>[^:]+):)?"
+                    r"(?P<local>[^{}]+)$")
+    __STEP_OBJ = None
+
+    def __init__(self, include=None, exclude=None, namespaces=None):
+        self.__compile_regexes()
+        self.__namespaces = namespaces or {}
+        self.__include = [self.__compile(p) for p in include or ()]
+        self.__exclude = [self.__compile(p) for p in exclude or ()]
+
+    @classmethod
+    def __compile_regexes(cls):
+        # The re module is slow to import, only import it when needed.
+        if cls.__TOKEN_OBJ is None:
+            import re
+            cls.__TOKEN_OBJ = re.compile(cls.__TOKEN_REGEX)
+            cls.__STEP_OBJ = re.compile(cls.__STEP_REGEX)
+
+    def initial(self):
+        """
+        Return the state that the root element is stepped from.
+        """
+        include = frozenset((idx, 0) for idx in range(len(self.__include)))
+        exclude = frozenset((idx, 0) for idx in range(len(self.__exclude)))
+        return include, exclude, not self.__include
+
+    def step(self, state, nspace, name):
+        """
+        Step from the parent's `state` into the element `nspace` and
+        `name`. Returns a tuple of (action, state) where action is one of
+        SKIP, KEEP or PENDING. PENDING means the element is only needed
+        if one of its descendants is kept.
+        """
+        include, exclude, kept = state
+        exclude, full = self.__advance(self.__exclude, exclude, nspace, name)
+
+        if full:
+            return self.SKIP, None
+
+        if not kept:
+            include, full = self.__advance(
+                self.__include, include, nspace, name)
+
+            if full:
+                kept = True
+            elif not include:
+                return self.SKIP, None
+            else:
+                return self.PENDING, (include, exclude, kept)
+
+        return self.KEEP, (include, exclude, kept)
+
+    def split_path(self, path):
+        """
+        Split a simple relative path, such as 'a/p:b', into a tuple of
+        (nspace, name) steps. Wildcards and // are not allowed, an empty
+        path or '.' returns an empty tuple.
+        """
+        if path in ('', '.'):
+            return ()
+
+        tokens = [mo for mo in self.__TOKEN_OBJ.finditer(path)]
+        valid = (''.join(mo.group() for mo in tokens) == path
+                 and len(tokens) % 2 == 1)
+        steps = []
+
+        for idx, mo in enumerate(tokens):
+            if not valid:
+                break
+            elif idx % 2:
+                valid = mo.group('sep') == '/'
+            elif mo.group('step'):
+                steps.append(self.__split_step(mo.group('step')))
+                valid = None not in steps[-1]
+            else:
+                valid = False
+
+        if not valid:
+            raise ValueError("Invalid relative path: {!r}".format(path))
+
+        return tuple(steps)
+
+    def __advance(self, paths, states, nspace, name):
+        new_states = set()
+        full = False
+
+        for idx, pos in states:
+            steps = paths[idx]
+            axis, s_nspace, s_name = steps[pos]
+
+            if axis == self.__DESCENDANT:
+                new_states.add((idx, pos))
+
+            if ((s_nspace is None or s_nspace == nspace)
+                    and (s_name is None or s_name == name)):
+                if pos + 1 == len(steps):
+                    full = True
+                else:
+                    new_states.add((idx, pos + 1))
+
+        return frozenset(new_states), full
+
+    def __compile(self, path):
+        steps = []
+        # Paths without a leading slash can start at any depth.
+        axis = self.__CHILD if path.startswith('/') else self.__DESCENDANT
+        expect_step = not path.startswith('/')
+        end = 0
+
+        for mo in self.__TOKEN_OBJ.finditer(path):
+            sep = mo.group('sep')
+
+            if mo.start() != end:
+                break
+            elif sep:
+                # Only a leading separator may come before the first step.
+                if expect_step and mo.start():
+                    break
+
+                axis = self.__DESCENDANT if sep == '//' else self.__CHILD
+                expect_step = True
+            elif expect_step:
+                steps.append((axis, ) + self.__split_step(mo.group('step')))
+                expect_step = False
+            else:
+                break
+
+            end = mo.end()
+
+        if end != len(path) or expect_step or not steps:
+            raise ValueError("Invalid selector path: {!r}".format(path))
+
+        return tuple(steps)
+
+    def __split_step(self, step):
+        if step == '*':
+            return None, None
+
+        sre = self.__STEP_OBJ.search(step)
+
+        if not sre:
+            raise ValueError("Invalid selector step: {!r}".format(step))
+
+        uri = sre.group('uri')
+        prefix = sre.group('prefix')
+        local = sre.group('local')
+
+        if uri is not None:
+            nspace = None if uri == '*' else uri
+        elif prefix is not None:
+            if prefix not in self.__namespaces:
+                raise ValueError(
+                    "Unknown namespace prefix {!r} in selector step "
+                    "{!r}".format(prefix, step))
+
+            nspace = self.__namespaces[prefix]
+        else:
+            nspace = self.__namespaces.get('', '')
+
+        return nspace, None if local == '*' else local
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+#
+# xml2dict/stats.py
+#
+# See MIT License file.
+#
+"""
+Statistics collected while XML2Dict parses a document.
+
+Collecting is only done when XML2Dict is created with `stats=True`, the
+parser target is then wrapped by a proxy that counts and times each
+event. Without it the parse runs exactly as before.
+"""
+__docformat__ = "restructuredtext en"
+
+from time import perf_counter
+
+
+class ParseStats(object):
+    """
+    The statistics of one parse.
+
+    Times are in seconds. `parser_time` is the time spent in the XML
+    parser itself, `build_time` the time spent building the output not
+    counting `value_hook` which is in `hook_time`. `output_nodes` is the
+    peak number of output nodes held at once. With parse() these are all
+    the nodes built, with iterparse() the records ended in one chunk of
+    the xml, that are yielded together, and the record being parsed, with
+    parse_columns() the values in the columns and with dump() none.
+    `distinct_namespaces` counts the namespaces of both tags and
+    attributes. `bytes_read` counts characters when the xml is a str.
+
+    `cached` is True when parse() found the result in its cache, then only
+    `bytes_read` and the times are set and all the time, spent getting the
+    result, is `build_time`.
+    """
+    FIELDS = ('bytes_read', 'elements', 'attributes', 'max_depth',
+              'distinct_tags', 'distinct_namespaces', 'output_nodes',
+              'total_time', 'parser_time', 'build_time', 'hook_time',
+              'cached')
+
+    def __init__(self):
+        self.bytes_read = 0
+        self.elements = 0
+        self.attributes = 0
+        self.max_depth = 0
+        self.tags = set()
+        self.namespaces = set()
+        self.output_nodes = 0
+        self.total_time = 0.0
+        self.target_time = 0.0
+        self.hook_time = 0.0
+        self.cached = False
+
+    @property
+    def distinct_tags(self):
+        return len(self.tags)
+
+    @property
+    def distinct_namespaces(self):
+        return len(self.namespaces)
+
+    @property
+    def parser_time(self):
+        return max(self.total_time - self.target_time, 0.0)
+
+    @property
+    def build_time(self):
+        return max(self.target_time - self.hook_time, 0.0)
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __repr__(self):
+        return "<ParseStats {}>".format(', '.join(
+            "{}={}".format(field, round(value, 6)
+                           if isinstance(value, float) else value)
+            for field, value in self.as_dict().items()))
+
+
+class _StatsTarget(object):
+    """
+    Proxy for a parser target that counts and times the events passed to
+    it. The target's `_value_hook`, when it has one, is timed as well.
+    """
+
+    def __init__(self, target, stats):
+        self._target = target
+        self._stats = stats
+        self._depth = 0
+        value_hook = getattr(target, '_value_hook', None)
+
+        if value_hook is not None:
+            target._value_hook = self._timed(value_hook)
+
+    def _timed(self, value_hook):
+        stats = self._stats
+
+        def timed_hook(value):
+            start = perf_counter()
+
+            try:
+                return value_hook(value)
+            finally:
+                stats.hook_time += perf_counter() - start
+
+        return timed_hook
+
+    def start(self, tag, attrib):
+        start = perf_counter()
+        stats = self._stats
+        stats.elements += 1
+        stats.attributes += len(attrib)
+        stats.tags.add(tag)
+        self._depth += 1
+
+        for name in attrib:
+            if name[:1] == '{':
+                stats.namespaces.add(name[1:].rpartition('}')[0])
+
+        if self._depth > stats.max_depth:
+            stats.max_depth = self._depth
+
+        self._target.start(tag, attrib)
+        stats.target_time += perf_counter() - start
+
+    def data(self, text):
+        start = perf_counter()
+        self._target.data(text)
+        self._stats.target_time += perf_counter() - start
+
+    def end(self, tag):
+        start = perf_counter()
+        self._depth -= 1
+        self._target.end(tag)
+        self._stats.target_time += perf_counter() - start
+
+    def close(self):
+        start = perf_counter()
+        result = self._target.close()
+        self._stats.output_nodes = self._target.peak_nodes
+        self._stats.target_time += perf_counter() - start
+        return result
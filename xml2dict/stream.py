@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+#
+# xml2dict/stream.py
+#
+# See MIT License file.
+#
+"""
+Write the XML2Dict structure as JSON or NDJSON while the XML is parsed.
+
+The output is written to any object with a `write()` method as each chunk
+of the XML is parsed, so memory use depends on the depth of the document
+and not on its size.
+
+Entry point:
+ - main() -- The xml2json command line tool.
+"""
+__docformat__ = "restructuredtext en"
+
+import sys
+import json
+import argparse
+
+import defusedxml.ElementTree as ET
+
+from .xml2dict import XML2Dict, _DictTarget
+
+
+class _JSONTarget(_DictTarget):
+    """
+    Parser target that writes the JSON of each element as soon as it is
+    known instead of building the dicts.
+    """
+
+    def __init__(self, converter, selector, write, strip_list):
+        super(_JSONTarget, self).__init__(converter, selector)
+        self._write = write
+        self._strip_list = strip_list
+        self._count = 0
+
+        if not strip_list:
+            write('[')
+
+    @property
+    def started(self):
+        """
+        True once the first element of the output has started.
+        """
+        return self._count > 0
+
+    def close(self):
+        if not self._strip_list:
+            self._write(']')
+        elif not self._count:
+            self._write('[]')
+
+    @property
+    def peak_nodes(self):
+        # Nodes are written as soon as they are built, none are kept.
+        return 0
+
+    def _materialize(self, frame, idx):
+        if idx:
+            parent = self._stack[idx - 1]
+
+            if parent.node is None:
+                self._materialize(parent, idx - 1)
+
+            count = parent.children
+            parent.children += 1
+        else:
+            count = self._count
+            self._count += 1
+
+        if count:
+            self._write(', ')
+
+        frame.node = True
+
+        if frame.parts is None:
+            self._build_node(frame)
+
+    def _build_node(self, frame):
+        attrib, element = self._convert(frame)
+        self._write('{"attrib": ')
+        self._write(json.dumps(attrib))
+        self._write(', "element": ')
+        self._write(json.dumps(element))
+        self._write(', "children": [')
+        frame.children = 0
+        frame.attrib = frame.text = None
+
+    def _end_node(self, frame):
+        self._write(']}')
+
+
+class XML2JSON(XML2Dict):
+    """
+    Write the same structure XML2Dict.parse() returns as JSON, or one
+    NDJSON line per record, without building the whole structure first.
+    """
+
+    def dump(self, xml, fp, encoding=None):
+        """
+        Write the JSON of the whole document to `fp`. The output is the
+        same as json.dumps(XML2Dict().parse(xml)). Nothing is written
+        before the first element starts so xml that can't be parsed at all
+        writes nothing, a parse error after that leaves the JSON
+        incomplete.
+        """
+        buf = []
+        target = _JSONTarget(self, self._selector, buf.append,
+                             self._strip_list)
+
+        for _ in self._feed(xml, target, encoding):
+            if target.started:
+                fp.write(''.join(buf))
+                del buf[:]
+
+        fp.write(''.join(buf))
+
+    def dump_records(self, xml, fp, record, encoding=None):
+        """
+        Write each element matching the `record` selector path to `fp` as
+        a line of JSON.
+        """
+        for data in self.iterparse(xml, record, encoding=encoding):
+            fp.write(json.dumps(data))
+            fp.write('\n')
+
+
+def _namespace(value):
+    prefix, sep, uri = value.partition('=')
+
+    if not sep:
+        raise argparse.ArgumentTypeError(
+            "Namespace must be prefix=uri, found: {}".format(value))
+
+    return prefix, uri
+
+
+def main(argv=None):
+    """
+    Command line entry point, see `xml2json --help`.
+    """
+    parser = argparse.ArgumentParser(
+        prog='xml2json',
+        description="Convert XML to the xml2dict structure as JSON or "
+                    "NDJSON while streaming.",
+        epilog="The exit status is 1 when the XML can't be parsed, the "
+               "output is then incomplete and not valid JSON.")
+    parser.add_argument(
+        'infile', nargs='?', type=argparse.FileType('rb'),
+        help="XML input file, default stdin.")
+    parser.add_argument(
+        '-o', '--outfile', type=argparse.FileType('w'), default=sys.stdout,
+        help="Output file, default stdout.")
+    parser.add_argument(
+        '-r', '--record', help="Write one NDJSON line for each element "
+        "matching this selector path.")
+    parser.add_argument(
+        '-i', '--include', action='append', help="Selector path of "
+        "elements to keep, can be given more than once.")
+    parser.add_argument(
+        '-x', '--exclude', action='append', help="Selector path of "
+        "elements to skip, can be given more than once.")
+    parser.add_argument(
+        '-n', '--namespace', action='append', type=_namespace, default=[],
+        help="A prefix=uri used in selector paths, can be given more than "
+        "once.")
+    parser.add_argument(
+        '-e', '--encoding', help="Override the encoding of the XML.")
+    parser.add_argument(
+        '-s', '--strip-list', action='store_true',
+        help="Do not wrap the root element in a list.")
+    parser.add_argument(
+        '-w', '--keep-whitespace', action='store_true',
+        help="Do not strip whitespace from element values.")
+    options = parser.parse_args(argv)
+    infile = options.infile or sys.stdin.buffer
+
+    try:
+        x2j = XML2JSON(rm_whitespace=not options.keep_whitespace,
+                       strip_list=options.strip_list,
+                       include=options.include, exclude=options.exclude,
+                       namespaces=dict(options.namespace))
+
+        if options.record:
+            x2j.dump_records(infile, options.outfile, options.record,
+                             encoding=options.encoding)
+        else:
+            x2j.dump(infile, options.outfile, encoding=options.encoding)
+            options.outfile.write('\n')
+    except (ValueError, LookupError) as e:
+        # LookupError is an unknown encoding.
+        parser.error(str(e))
+    except ET.ParseError:
+        return 1  # The error has already been logged.
+    finally:
+        options.outfile.flush()
+
+    return 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
@@ -12,20 +12,245 @@ __docformat__ = "restructuredtext en"
 
 
 import io
-import re
-import six
-import logging
-import defusedxml.ElementTree as ET
+import time
+
+from .selector import Selector
+
+# The modules for logging, defusedxml and each optional mode are slow to
+# import, they are only imported when first used.
+
+
+class _Frame(object):
+    """
+    Parse state of an element that has been started but not ended.
+    """
+    __slots__ = ('tag', 'attrib', 'parts', 'text', 'state', 'node',
+                 'children')
+
+    def __init__(self, tag, attrib, state):
+        self.tag = tag
+        self.attrib = attrib
+        self.parts = []
+        self.text = None
+        self.state = state
+        self.node = None
+        self.children = None
+
+
+class _DictTarget(object):
+    """
+    Parser target that builds the XML2Dict structure directly from the
+    parser events, no ElementTree is built. Subtrees skipped by the
+    selector are only counted so no Python objects are made for them.
+    """
+
+    def __init__(self, converter, selector=None):
+        self._converter = converter
+        self._value_hook = converter.value_hook
+        self._selector = selector
+        self._stack = []
+        self._skip = 0
+        self._data = []
+        self.nodes = 0
+
+    def start(self, tag, attrib):
+        if self._skip:
+            self._skip += 1
+            return
+
+        stack = self._stack
+
+        if stack:
+            parent = stack[-1]
+            self._end_text(parent)
+            state = parent.state
+        else:
+            parent = None
+            state = self._selector.initial() if self._selector else None
+
+        if self._selector:
+            nspace, name = self._converter._split_namespace(tag)
+            action, state = self._selector.step(state, nspace, name)
+
+            if action == Selector.SKIP:
+                self._skip = 1
+                return
+        else:
+            action = Selector.KEEP
+
+        frame = _Frame(tag, attrib, state)
+        stack.append(frame)
+
+        if action == Selector.KEEP:
+            self._materialize(frame, len(stack) - 1)
+
+    def data(self, text):
+        if not self._skip and self._stack:
+            parts = self._stack[-1].parts
+
+            # Text after the first child is a tail which is not kept.
+            if parts is not None:
+                parts.append(text)
+
+    def end(self, tag):
+        if self._skip:
+            self._skip -= 1
+            return
+
+        frame = self._stack.pop()
+        self._end_text(frame)
+
+        # A pending frame that is still not materialized is dropped.
+        if frame.node is not None:
+            self._end_node(frame)
+
+    def close(self):
+        return self._data
+
+    @property
+    def peak_nodes(self):
+        # Every node built is kept.
+        return self.nodes
+
+    def _end_text(self, frame):
+        """
+        The text of an element ends when its first child starts or when
+        it ends.
+        """
+        parts = frame.parts
+
+        if parts is not None:
+            frame.text = ''.join(parts) if parts else None
+            frame.parts = None
+
+            if frame.node is not None:
+                self._build_node(frame)
+
+    def _materialize(self, frame, idx):
+        if idx:
+            parent = self._stack[idx - 1]
+
+            if parent.node is None:
+                self._materialize(parent, idx - 1)
+
+            siblings = parent.children
+        else:
+            siblings = self._data
+
+        frame.node = {}
+        siblings.append(frame.node)
+
+        # Pending ancestors are only materialized after their text ended.
+        if frame.parts is None:
+            self._build_node(frame)
+
+    def _build_node(self, frame):
+        node = frame.node
+        node['attrib'], node['element'] = self._convert(frame)
+        frame.children = node['children'] = []
+        frame.attrib = frame.text = None
+
+    def _end_node(self, frame):
+        pass
+
+    def _convert(self, frame):
+        """
+        Return the attrib and element dicts of an element.
+        """
+        converter = self._converter
+        value_hook = self._value_hook
+        self.nodes += 1
+        nspace, name = converter._split_namespace(frame.tag)
+        text = value_hook(frame.text)
+        attrib = {k: value_hook(v) for k, v in frame.attrib.items()}
+        element = {'nspace': nspace,
+                   'tag': name,
+                   'value': converter._tag_value(text)}
+        return attrib, element
+
+
+class _RecordTarget(_DictTarget):
+    """
+    Parser target that collects the elements matching a record path
+    without their ancestors. Completed records are taken with `pop()`.
+    """
+
+    def __init__(self, converter, selector):
+        super(_RecordTarget, self).__init__(converter, selector)
+        self._record = None
+        self._record_start = 0
+        self._released = 0
+        self._peak = 0
+
+    def pop(self):
+        records = self._data
+        self._data = []
+        held = self.nodes - self._released
+
+        if held > self._peak:
+            self._peak = held
+
+        # Only the nodes of the record being parsed are still held.
+        if self._record is None:
+            self._released = self.nodes
+        else:
+            self._released = self._record_start
+
+        return records
+
+    @property
+    def peak_nodes(self):
+        return max(self._peak, self.nodes - self._released)
+
+    def _materialize(self, frame, idx):
+        if idx and self._stack[idx - 1].node is not None:
+            super(_RecordTarget, self)._materialize(frame, idx)
+        else:
+            # A record always starts before its text so is built later.
+            frame.node = {}
+            self._record = frame
+            self._record_start = self.nodes
+
+    def _end_node(self, frame):
+        if frame is self._record:
+            self._data.append(frame.node)
+            self._record = None
 
 
 class XML2Dict(object):
-    __NSPACE_REGEX = r"^\{(?P<uri>.*)\}(?P<local>.*)$"
-    __NSPACE_OBJ = re.compile(__NSPACE_REGEX)
+    """
+    Convert XML into a list of nested dicts.
+
+    `include` and `exclude` are lists of selector paths, see
+    xml2dict.selector for the syntax. When given, elements that are not
+    selected are skipped while parsing and never converted. Ancestors of
+    included elements are kept so the structure is the same as without
+    selectors. `namespaces` maps prefixes used in the paths to URIs.
+
+    When `lazy` is True parse() returns read-only views, see xml2dict.lazy,
+    that only convert the elements that are accessed.
+
+    When `stats` is True every parse collects a ParseStats object, see
+    xml2dict.stats, which is set on `last_stats` and passed to
+    stats_hook(). A parse answered from the cache gets one too, with
+    `cached` set.
+
+    `cache` can be a ResultCache, see xml2dict.cache, then parse() returns
+    a copy of the cached result when the same XML was parsed before with
+    the same options and value_hook. A value_hook is the same when
+    value_hook_key() returns the same str, without one only the same hook
+    object is and its results are not cached on disk. The cache is not
+    used in lazy mode.
+    """
+    __CHUNK_SIZE = 64 * 1024
     # __PREFIX_REGEX = r"^(?P<xmlns>xmlns):?(?P<prefix>.*)?$"
     # __PREFIX_OBJ = re.compile(__PREFIX_REGEX)
 
     def __init__(self, empty_tags=True, rm_whitespace=True, logger_name='',
-                 level=None, strip_list=False):
+                 level=None, strip_list=False, include=None, exclude=None,
+                 namespaces=None, lazy=False, stats=False, cache=None):
+        import logging
+
         if logger_name == '':
             logging.basicConfig()
 
@@ -36,68 +261,216 @@ class XML2Dict(object):
 
         self.__empty_tags = empty_tags
         self.__rm_whitespace = rm_whitespace
-        self.__strip_list = strip_list
+        self._strip_list = strip_list
+        self.__include = include
+        self.__exclude = exclude
+        self.__namespaces = namespaces
+        self.__lazy = lazy
+        self.__stats = stats
+        self.__cache = cache
+        self.last_stats = None
+
+        if include or exclude:
+            self._selector = Selector(include=include, exclude=exclude,
+                                      namespaces=namespaces)
+        else:
+            self._selector = None
 
     def _set_file_object(self, xml):
-        if isinstance(xml, io.IOBase):
-            xml.seek(0)  # Make sure we're at the start of the file.
-            self._xml = xml
+        """
+        Return a file object to read the xml from. It is never kept on
+        the instance so any number of parses can run at the same time.
+        """
+        if isinstance(xml, io.IOBase) or hasattr(xml, 'read'):
+            # Make sure we're at the start of the file, pipes and streams
+            # such as a WSGI input can't seek.
+            if getattr(xml, 'seekable', lambda: False)():
+                xml.seek(0)
+        elif isinstance(xml, bytes):
+            xml = io.BytesIO(xml)
         else:
-            self._xml = six.StringIO(xml)
+            xml = io.StringIO(xml)
+
+        return xml
 
     def parse(self, xml, encoding=None):
-        data = []
-        parser = ET.DefusedXMLParser(encoding=encoding)
-        self._set_file_object(xml)
+        if self.__cache is None or self.__lazy:
+            return self.__parse(xml, encoding)
+
+        start = time.perf_counter()
+        content = self._set_file_object(xml).read()
+        options, refs = self.__cache_options(encoding)
+        key = self.__cache.make_key(content, options)
+        data = self.__cache.get(key, refs)
+
+        if data is None:
+            data = self.__parse(content, encoding)
+            self.__cache.set(key, data, refs)
+        else:
+            self._log.debug("Found cached result %s.", key)
+
+            if self.__stats:
+                from .stats import ParseStats
+                stats = ParseStats()
+                stats.cached = True
+                stats.bytes_read = len(content)
+                stats.total_time = time.perf_counter() - start
+                stats.target_time = stats.total_time
+                self.__finish_stats(stats)
+
+        return data
+
+    def __cache_options(self, encoding):
+        """
+        Return the options that are part of the cache key and the objects
+        a result depends on when the value_hook has no key.
+        """
+        hook_key = self.value_hook_key()
+        refs = ()
+
+        if hook_key is None:
+            value_hook = self.value_hook
+            # A bound method is a new object each time, it is the same hook
+            # when its function and instance are.
+            refs = (getattr(value_hook, '__func__', value_hook),
+                    getattr(value_hook, '__self__', None))
+
+        namespaces = sorted((self.__namespaces or {}).items())
+        options = (self.__empty_tags, self.__rm_whitespace, self._strip_list,
+                   self.__include, self.__exclude, namespaces, encoding,
+                   hook_key)
+        return options, refs
+
+    def __parse(self, xml, encoding):
+        if self.__lazy:
+            from .lazy import _TreeTarget, LazyList
+            target = _TreeTarget(self, self._selector)
+        else:
+            target = _DictTarget(self, self._selector)
+
+        for _ in self._feed(xml, target, encoding):
+            pass
+
+        data = target.close()
+
+        if self.__lazy:
+            data = LazyList(self, data)
+
+        # Never format the data itself, it can be huge.
+        self._log.debug("Parsed %d root element(s).", len(data))
+
+        if self._strip_list and len(data) == 1:
+            data = data[0]
+
+        return data
+
+    def iterparse(self, xml, record, encoding=None):
+        """
+        Yield the dict of each element matching the `record` selector path
+        as soon as the element ends. Only the record being parsed is kept
+        in memory. The `exclude` selectors still apply inside a record,
+        `include` is replaced by `record`.
+        """
+        selector = Selector(include=[record], exclude=self.__exclude,
+                            namespaces=self.__namespaces)
+        target = _RecordTarget(self, selector)
+
+        for _ in self._feed(xml, target, encoding):
+            for record_data in target.pop():
+                yield record_data
+
+    def parse_columns(self, xml, record, fields, types=None, encoding=None):
+        """
+        Extract the elements matching the `record` selector path into
+        columns in one pass, see xml2dict.columnar. `fields` maps each
+        column name to a field path relative to the record and `types`
+        maps column names to an array typecode for numeric columns.
+        Returns a dict of the columns.
+        """
+        selector = Selector(include=[record], exclude=self.__exclude,
+                            namespaces=self.__namespaces)
+        from .columnar import _ColumnTarget
+        target = _ColumnTarget(self, selector, fields, types=types,
+                               namespaces=self.__namespaces)
+
+        for _ in self._feed(xml, target, encoding):
+            pass
+
+        return target.close()
+
+    def _feed(self, xml, target, encoding=None):
+        """
+        Feed the xml to a parser with `target` one chunk at a time,
+        yielding after each chunk and after the parser is closed.
+        """
+        import defusedxml.ElementTree as ET
+
+        if self.__stats:
+            from .stats import ParseStats, _StatsTarget
+            stats = ParseStats()
+            target = _StatsTarget(target, stats)
+            timer = time.perf_counter
+        else:
+            stats = None
+
+        parser = ET.DefusedXMLParser(target=target, encoding=encoding)
+        fp = self._set_file_object(xml)
 
         try:
-            tree = ET.parse(self._xml, parser=parser, forbid_dtd=True)
-            root = tree.getroot()
-            self.__node(data, root)
+            while True:
+                chunk = fp.read(self.__CHUNK_SIZE)
+
+                if not chunk:
+                    break
+
+                if stats:
+                    start = timer()
+                    parser.feed(chunk)
+                    stats.total_time += timer() - start
+                    stats.bytes_read += len(chunk)
+                else:
+                    parser.feed(chunk)
+
+                yield
+
+            if stats:
+                start = timer()
+                parser.close()
+                stats.total_time += timer() - start
+            else:
+                parser.close()
         except ET.ParseError as e:
             self._log.error("Could not parse xml, %s", e, exc_info=True)
             raise e
 
-        if self.__strip_list and len(data) == 1:
-            data = data[0]
+        if stats:
+            self.__finish_stats(stats)
 
-        self._log.debug("data: %s", data)
-        return data
+        yield
 
-    def __node(self, data, node):
-        child_data = {}
-        data.append(child_data)
-        # Process tag
-        tag_name = node.tag
-        nspace, name = self.__split_namespace(tag_name)
-        text = self.value_hook(node.text)
-        child_data['attrib'] = {k: self.value_hook(v)
-                                for k, v in node.attrib.items()}
-        child_data['element'] = {'nspace': nspace,
-                                 'tag': name,
-                                 'value': self.__tag_value(text)}
-        children_data = []
-        child_data['children'] = children_data
-        has_findall = hasattr(node, 'findall')  # Only from 3.8 and greater.
-        children = node.findall("./*") if has_findall else node.getchildren()
-
-        for child in children:
-            self.__node(children_data, child)
-
-    def __split_namespace(self, tag):
-        sre = self.__NSPACE_OBJ.search(tag)
-
-        if sre:
-            nspace = sre.group('uri')
-            name = sre.group('local')
-        else:
-            nspace = ''
-            name = tag
+    def __finish_stats(self, stats):
+        # The namespaces of attributes were added while parsing.
+        stats.namespaces.update(self._split_namespace(tag)[0]
+                                for tag in stats.tags)
+        stats.namespaces.discard('')
+        self.last_stats = stats
+        self._log.debug("%r", stats)
+        self.stats_hook(stats)
+
+    def _split_namespace(self, tag):
+        if tag[:1] == '{':
+            nspace, sep, name = tag[1:].rpartition('}')
 
-        return nspace, name
+            if sep:
+                return nspace, name
 
-    def __tag_value(self, text):
-        if text:
+        return '', tag
+
+    def _tag_value(self, text):
+        # Values value_hook converted to other types are left as they are.
+        if not isinstance(text, str) and text is not None:
+            pass
+        elif text:
             if self.__rm_whitespace:
                 text = text.strip()
         elif self.__empty_tags:
@@ -110,3 +483,22 @@ class XML2Dict(object):
         This hook can be overridden to convert values to Python types.
         """
         return value
+
+    def value_hook_key(self):
+        """
+        Return a str that identifies what value_hook returns, it is part of
+        the cache key. Override it together with value_hook for results to
+        be shared by instances and cached on disk, it must change whenever
+        the hook would return other values, such as with the instance state
+        the hook uses. None, the default for an overridden value_hook, only
+        caches results in memory for the same hook object.
+        """
+        value_hook = getattr(self.value_hook, '__func__', None)
+        return '' if value_hook is XML2Dict.value_hook else None
+
+    def stats_hook(self, stats):
+        """
+        This hook can be overridden to receive the ParseStats of each parse
+        when `stats` is True.
+        """
+        pass